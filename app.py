@@ -2,18 +2,27 @@
 # app.py (Single-File App)
 ###############################
 
+import bisect
+import os
+import queue
+import re
+import sqlite3
+import threading
+from concurrent.futures import Future
 import streamlit as st
-import pandas as pd
 import requests
-import folium
-from streamlit_folium import folium_static
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-import xmltodict
+from typing import Final
+from urllib.parse import quote_plus
 import time
 
+# Heavy, page-specific dependencies (folium, pandas, torch, transformers,
+# optimum) are imported inside the functions that use them, so pages that
+# don't need them never pay their import cost.
 # For AI Chatbot
-# Make sure to install: pip install transformers
-#from transformers import pipeline
+# Make sure to install: pip install transformers "optimum[onnxruntime]"
 
 st.set_page_config(
     page_title="Cancer Support App",
@@ -26,17 +35,393 @@ st.set_page_config(
     }
 )
 
-# Set up a local Question-Answering pipeline (distilbert-based)
-# This model is small enough to run locally without API keys.
+# One pooled HTTP session for every external API call (keep-alive + gzip).
+# Nominatim requires an identifying User-Agent. Cached as a resource so the
+# pool survives Streamlit reruns, which re-execute this whole script.
 @st.cache_resource
-def load_qa_pipeline():
+def _http_session():
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": "CancerSupportApp/1.0 (support@example.com)",
+        "Accept-Encoding": "gzip, deflate"
+    })
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+SESSION = _http_session()
+
+# Set up a local Question-Answering pipeline (MiniLM-based)
+# This model is small enough to run locally without API keys.
+QA_MODEL_ID = "deepset/minilm-uncased-squad2"
+QA_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+QA_CACHE_DIR = os.path.join(QA_MODEL_DIR, "hub")
+# Intra-op threads for the QA model (both ONNX Runtime and PyTorch); set
+# QA_NUM_THREADS=1 on shared hosts serving one short question at a time.
+QA_NUM_THREADS = int(os.environ.get("QA_NUM_THREADS", os.cpu_count() or 1))
+# QA_STATIC_QUANT=1 builds a statically quantized ONNX model (activations
+# calibrated ahead of time) instead of the dynamic one. Opt-in until its
+# answers have been checked against the dynamic model.
+QA_STATIC_QUANT = os.environ.get("QA_STATIC_QUANT") == "1"
+# The context is short and fixed: one 256-token window always holds the
+# (capped) question plus the whole context, so every question is exactly
+# one forward pass, never a sliding window.
+QA_MAX_LENGTH = 256
+QA_MAX_QUESTION_LEN = 64
+QA_MAX_ANSWER_LEN = 15
+
+# A sample context about cancer from reputable sources (shortened for demonstration)
+QA_CONTEXT = (
+    "Cancer is a group of diseases characterized by the uncontrolled growth and spread of abnormal cells. "
+    "There are over 100 different types of cancer. Treatment options vary and may include surgery, chemotherapy, "
+    "radiation therapy, targeted therapy, immunotherapy, or a combination of these. Early detection and accurate "
+    "diagnosis are crucial for better outcomes. Various support services exist to help patients cope with the "
+    "physical, emotional, and financial challenges of cancer."
+)
+
+# Typical chatbot questions, used to calibrate activation ranges for static
+# quantization
+QA_CALIBRATION_QUESTIONS = [
+    "What is cancer?",
+    "How many types of cancer are there?",
+    "What are the treatment options for cancer?",
+    "How is cancer treated?",
+    "Can surgery treat cancer?",
+    "What is chemotherapy?",
+    "What is radiation therapy?",
+    "What is immunotherapy?",
+    "What is targeted therapy?",
+    "Why is early detection important?",
+    "What improves cancer outcomes?",
+    "Why does accurate diagnosis matter?",
+    "What causes cancer?",
+    "How does cancer spread?",
+    "What are abnormal cells?",
+    "Is cancer one disease?",
+    "What support is available for cancer patients?",
+    "Who can help me cope with cancer?",
+    "Are there financial support services?",
+    "Is there emotional support for patients?",
+    "What challenges do cancer patients face?",
+    "Can treatments be combined?",
+    "What is a combination therapy?",
+    "How do I cope with a diagnosis?",
+    "what is cancer",
+    "treatment options",
+    "how many cancers exist",
+    "does chemo work",
+    "what helps patients cope",
+    "is early detection crucial",
+    "what kind of growth is cancer",
+    "Which therapies are used for cancer treatment?"
+]
+
+# QA_OFFLINE=1 is set once the weights were pre-downloaded at build time (see
+# README): never touch the HuggingFace Hub at startup. An explicit flag rather
+# than checking for models/hub, which an interrupted first download also
+# leaves behind.
+QA_OFFLINE = os.environ.get("QA_OFFLINE") == "1"
+if QA_OFFLINE:
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+def _calibrate(quantizer, tokenizer, qconfig):
+    # Min/max activation ranges from the calibration questions asked against
+    # the chatbot's own context
     try:
-        nlp = pipeline("question-answering", model="distilbert-base-cased-distilled-squad")
-        return nlp
-    except:
-        return None
+        from datasets import Dataset
+    except ImportError as e:
+        raise ImportError("QA_STATIC_QUANT=1 requires the 'datasets' package") from e
+    from optimum.onnxruntime.configuration import AutoCalibrationConfig
+
+    encodings = tokenizer(
+        QA_CALIBRATION_QUESTIONS,
+        [QA_CONTEXT] * len(QA_CALIBRATION_QUESTIONS),
+        truncation="only_second",
+        max_length=QA_MAX_LENGTH
+    )
+    calibration_dataset = Dataset.from_dict(dict(encodings))
+    return quantizer.fit(
+        dataset=calibration_dataset,
+        calibration_config=AutoCalibrationConfig.minmax(calibration_dataset),
+        operators_to_quantize=qconfig.operators_to_quantize
+    )
+
+QA_ORT_FILE = "model_optimized_quantized.onnx"
+
+def build_ort_qa():
+    # Exports, fuses and quantizes the QA model to ONNX unless that was
+    # already done, and returns its directory. Run once at image build time
+    # (see README) so fresh containers skip it on their first question.
+    from optimum.onnxruntime import ORTModelForQuestionAnswering, ORTOptimizer, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig, OptimizationConfig
+    from transformers import AutoTokenizer
+
+    variant = "onnx-int8-static" if QA_STATIC_QUANT else "onnx-int8"
+    save_dir = os.path.join(QA_MODEL_DIR, variant, QA_MODEL_ID.replace("/", "--"))
+    if not os.path.isfile(os.path.join(save_dir, QA_ORT_FILE)):
+        ort_model = ORTModelForQuestionAnswering.from_pretrained(
+            QA_MODEL_ID, export=True, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE
+        )
+        # Graph fusions first (writes model_optimized.onnx), then quantize
+        # the fused graph
+        optimizer = ORTOptimizer.from_pretrained(ort_model)
+        optimizer.optimize(save_dir=save_dir, optimization_config=OptimizationConfig(optimization_level=2))
+        tokenizer = AutoTokenizer.from_pretrained(QA_MODEL_ID, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE)
+        tokenizer.save_pretrained(save_dir)
+        quantizer = ORTQuantizer.from_pretrained(save_dir, file_name="model_optimized.onnx")
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=QA_STATIC_QUANT, per_channel=False)
+        ranges = None
+        if QA_STATIC_QUANT:
+            ranges = _calibrate(quantizer, tokenizer, qconfig)
+        quantizer.quantize(save_dir=save_dir, quantization_config=qconfig, calibration_tensors_range=ranges)
+    return save_dir
+
+def _load_ort_qa():
+    # ONNX Runtime with fused attention/LayerNorm/GELU and INT8 weights
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForQuestionAnswering
+    from optimum.pipelines import pipeline
+    from transformers import AutoTokenizer
+
+    save_dir = build_ort_qa()
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = QA_NUM_THREADS
+    ort_model = ORTModelForQuestionAnswering.from_pretrained(
+        save_dir, file_name=QA_ORT_FILE, session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(save_dir)
+    return pipeline("question-answering", model=ort_model, tokenizer=tokenizer, accelerator="ort")
+
+def _compile_qa(torch, nlp):
+    # Inductor fuses the QKV projections and LayerNorm+GELU. Compilation is
+    # lazy, so warm-up batches compile it up front (and surface graphs it
+    # cannot handle, e.g. on older torch); on any failure stay eager.
+    # Dynamo always specializes a size of 1, so a lone question and a
+    # micro-batch are separate graphs: warm up both, or the first real batch
+    # would recompile inside the batcher while callers time out. The default
+    # mode rather than "reduce-overhead", which records a CUDA graph per
+    # (batch, length) shape and grows with every new question length.
+    eager_model = nlp.model
+    warmup = [("What is cancer?", "Cancer is a group of diseases."), ("How is it treated?", "With surgery.")]
+    try:
+        nlp.model = torch.compile(eager_model, dynamic=True)
+        answer_questions(nlp, warmup[:1])
+        answer_questions(nlp, warmup)
+    except Exception:
+        nlp.model = eager_model
+
+def _cpu_has_vnni(torch):
+    try:
+        return torch.cpu._is_vnni_supported()
+    except Exception:
+        return False
+
+def _cpu_has_bf16(torch):
+    # Native BF16 only (Sapphire Rapids, Zen4); oneDNN also "supports" BF16 on
+    # plain AVX-512 by emulation, which is slower than FP32
+    try:
+        return torch.cpu._is_avx512_bf16_supported() or torch.cpu._is_amx_tile_supported()
+    except Exception:
+        return False
 
-nlp_qa = load_qa_pipeline()
+def _load_torch_qa():
+    import torch
+    from transformers import AutoModelForQuestionAnswering, AutoTokenizer, pipeline
+
+    torch.set_num_threads(QA_NUM_THREADS)
+
+    tokenizer = AutoTokenizer.from_pretrained(QA_MODEL_ID, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE)
+    model = AutoModelForQuestionAnswering.from_pretrained(
+        QA_MODEL_ID, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE
+    )
+    model.eval()
+
+    # CPUs with native BF16 (AVX512-BF16/AMX) run the FP32 weights under BF16
+    # autocast. They all have VNNI too, so this is checked first. Otherwise
+    # INT8 weights for every nn.Linear; only worth it on CPUs with VNNI
+    # (fbgemm is built into every x86 torch, but without VNNI its INT8
+    # kernels are no faster than FP32).
+    autocast_dtype = None
+    if _cpu_has_bf16(torch):
+        autocast_dtype = torch.bfloat16
+    elif _cpu_has_vnni(torch) and "fbgemm" in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = "fbgemm"
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    nlp = pipeline("question-answering", model=model, tokenizer=tokenizer)
+    nlp.autocast_dtype = autocast_dtype
+    _compile_qa(torch, nlp)
+    return nlp
+
+def _cuda_available():
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+def _ort_available():
+    from importlib.util import find_spec
+
+    return all(find_spec(name) is not None for name in ("onnxruntime", "optimum", "optimum.onnxruntime"))
+
+def _load_cuda_qa():
+    # On a GPU, FP16 weights beat CPU INT8 by an order of magnitude
+    import torch
+    from transformers import AutoModelForQuestionAnswering, AutoTokenizer, pipeline
+
+    torch.backends.cuda.matmul.allow_tf32 = True
+
+    tokenizer = AutoTokenizer.from_pretrained(QA_MODEL_ID, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE)
+    model = AutoModelForQuestionAnswering.from_pretrained(
+        QA_MODEL_ID, cache_dir=QA_CACHE_DIR, local_files_only=QA_OFFLINE, torch_dtype=torch.float16
+    )
+    model.eval()
+
+    nlp = pipeline("question-answering", model=model, tokenizer=tokenizer, device=0)
+    nlp.autocast_dtype = None
+    _compile_qa(torch, nlp)
+    return nlp
+
+# One model instance shared by every session. Load failures raise instead of
+# returning None, so a transient download error is not cached for the life
+# of the server.
+@st.cache_resource(ttl=None, max_entries=1, show_spinner=False)
+def load_qa_pipeline():
+    if _cuda_available():
+        return _load_cuda_qa()
+    # Only a missing optimum/onnxruntime falls back to PyTorch; any other
+    # failure on the ONNX path (e.g. QA_STATIC_QUANT=1 without 'datasets')
+    # raises instead of silently switching backends
+    if _ort_available():
+        return _load_ort_qa()
+    return _load_torch_qa()
+
+# The context is the same for every question, so it is tokenized once and
+# each question only tokenizes its own (short) text.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _encode_context(_tokenizer, context):
+    encoding = _tokenizer(context, add_special_tokens=False, return_offsets_mapping=True)
+    return encoding["input_ids"], encoding["offset_mapping"]
+
+# Not memoized: _encode only runs on an answer-cache miss in _qa, which is
+# keyed on the same (question, context).
+def _encode(tokenizer, context, question):
+    import torch
+
+    context_ids, context_offsets = _encode_context(tokenizer, context)
+    question_ids = tokenizer(question, add_special_tokens=False)["input_ids"][:QA_MAX_QUESTION_LEN]
+
+    # BERT-style [CLS] question [SEP] context [SEP]; the context is cut to
+    # whatever fits after the question.
+    budget = QA_MAX_LENGTH - tokenizer.num_special_tokens_to_add(pair=True) - len(question_ids)
+    context_ids, context_offsets = context_ids[:budget], context_offsets[:budget]
+    input_ids = tokenizer.build_inputs_with_special_tokens(question_ids, context_ids)
+    context_start = len(tokenizer.build_inputs_with_special_tokens(question_ids))
+
+    inputs = {
+        "input_ids": torch.tensor([input_ids]),
+        "attention_mask": torch.ones((1, len(input_ids)), dtype=torch.long)
+    }
+    if "token_type_ids" in tokenizer.model_input_names:
+        token_type_ids = tokenizer.create_token_type_ids_from_sequences(question_ids, context_ids)
+        inputs["token_type_ids"] = torch.tensor([token_type_ids])
+    return inputs, context_offsets, context_start
+
+def _best_span(start_logits, end_logits, offsets, context_start, context):
+    # Top-1 span that lies entirely inside the context, or "" when the
+    # model scores "no answer" (the [CLS] position) higher
+    null_score = float(start_logits[0] + end_logits[0])
+    context_end = context_start + len(offsets)
+    start_logits = start_logits[context_start:context_end].float().tolist()
+    end_logits = end_logits[context_start:context_end].float().tolist()
+    start, end = max(
+        ((s, e) for s in range(len(offsets)) for e in range(s, min(s + QA_MAX_ANSWER_LEN, len(offsets)))),
+        key=lambda span: start_logits[span[0]] + end_logits[span[1]]
+    )
+    if start_logits[start] + end_logits[end] < null_score:
+        return ""
+    return context[offsets[start][0]:offsets[end][1]]
+
+def answer_questions(qa, pairs):
+    # Answers a batch of (question, context) pairs with one forward pass,
+    # calling the model directly instead of going through the pipeline's
+    # per-call pre/post-processing.
+    import torch
+    from torch.nn.utils.rnn import pad_sequence
+
+    encoded = [_encode(qa.tokenizer, context, question) for question, context in pairs]
+    pad_values = {"input_ids": qa.tokenizer.pad_token_id, "attention_mask": 0, "token_type_ids": 0}
+    batch = {
+        name: pad_sequence([inputs[name][0] for inputs, _, _ in encoded], batch_first=True, padding_value=pad)
+        for name, pad in pad_values.items()
+        if name in encoded[0][0]
+    }
+    device = getattr(qa.model, "device", None)
+    if device is not None and device.type != "cpu":
+        batch = {name: tensor.to(device) for name, tensor in batch.items()}
+    # No autograd bookkeeping for the forward pass; BF16 autocast only where
+    # the loader enabled it (never for ONNX Runtime or INT8 models)
+    autocast_dtype = getattr(qa, "autocast_dtype", None)
+    with torch.inference_mode(), torch.autocast("cpu", dtype=torch.bfloat16, enabled=autocast_dtype is not None):
+        outputs = qa.model(**batch)
+
+    return [
+        _best_span(outputs.start_logits[i], outputs.end_logits[i], offsets, context_start, context)
+        for i, ((_, context), (_, offsets, context_start)) in enumerate(zip(pairs, encoded))
+    ]
+
+QA_BATCH_WINDOW = 0.02
+QA_MAX_BATCH = 16
+
+class _QABatcher:
+    """Answers questions from concurrent sessions in micro-batches.
+
+    A single worker thread owns the model: it waits up to QA_BATCH_WINDOW
+    seconds to collect more questions after the first one arrives, then
+    answers them all with one forward pass.
+    """
+
+    def __init__(self, qa):
+        self.qa = qa
+        self.queue = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, question, context):
+        future = Future()
+        self.queue.put((question, context, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + QA_BATCH_WINDOW
+            while len(batch) < QA_MAX_BATCH:
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            try:
+                answers = answer_questions(self.qa, [(question, context) for question, context, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, _, future), answer in zip(batch, answers):
+                    future.set_result(answer)
+
+@st.cache_resource(show_spinner=False)
+def _qa_batcher():
+    return _QABatcher(load_qa_pipeline())
+
+# Memoized answers: Streamlit reruns the page on every widget event and the
+# context is fixed, so common questions never reach the model twice. The
+# model is uncased, so lowercasing the key does not change the answer.
+@st.cache_data(max_entries=512, show_spinner=False)
+def _qa(question, context):
+    return _qa_batcher().submit(question, context).result(timeout=10)
 
 ###############################
 # PAGE CONFIG & GLOBAL STYLING
@@ -179,7 +564,15 @@ h1, h2, h3, h4, h5, h6, p, div, span, label {
 </style>
 """
 
-st.markdown(custom_css, unsafe_allow_html=True)
+# The stylesheet has to be re-emitted on every rerun (Streamlit drops
+# elements a run does not redraw), so send it without comments/whitespace.
+# Minified once per process, not on every rerun.
+@st.cache_resource
+def _minified_css():
+    css = re.sub(r"/\*.*?\*/", "", custom_css, flags=re.S)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", re.sub(r"\s+", " ", css)).strip()
+
+st.markdown(_minified_css(), unsafe_allow_html=True)
 
 
 ###############################
@@ -206,24 +599,22 @@ PAGES = [
     "AI Chatbot (Beta)"
 ]
 
+_NAV_HTML: Final[str] = (
+    '<div class="navbar">' +
+    "".join(f'<a href="?page={quote_plus(page)}">{page}</a>' for page in PAGES) +
+    '</div>'
+)
+
 def navbar():
     """Render a custom top navbar with clickable links to switch pages."""
-    st.markdown(
-        """
-        <div class="navbar">
-        """ +
-        "".join([f'<a href="?page={page.replace(" ", "+")}">{page}</a>' for page in PAGES]) +
-        """
-        </div>
-        """, 
-        unsafe_allow_html=True
-    )
+    st.markdown(_NAV_HTML, unsafe_allow_html=True)
 
     # Read query params to see if user switched pages
-    query_params = st.experimental_get_query_params()
-    if 'page' in query_params:
-        selected_page = query_params['page'][0].replace("+", " ")
-        if selected_page in PAGES:
+    selected_page = st.query_params.get("page")
+    if selected_page is not None:
+        # PAGE_FNS (defined with the page functions below) doubles as an
+        # O(1) whitelist of valid page names
+        if selected_page in PAGE_FNS:
             st.session_state.current_page = selected_page
     else:
         st.session_state.current_page = "Home"
@@ -273,6 +664,88 @@ def home_page():
 ###############################
 # PAGE: LOCATE HOSPITALS
 ###############################
+# "lat, lon" input skips geocoding entirely
+_LATLON_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+# Leaflet marker factory for FastMarkerCluster rows of [lat, lon, name]
+_HOSPITAL_MARKER_JS = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    var popup = document.createElement('div');
+    popup.textContent = row[2];
+    marker.bindPopup(popup);
+    return marker;
+}
+"""
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _geocode(location):
+    # Geocode using Nominatim; returns None when the location is unknown
+    geocode_url = "https://nominatim.openstreetmap.org/search"
+    geocode_params = {
+        "q": location,
+        "format": "json",
+        "limit": 1
+    }
+    geocode_response = SESSION.get(geocode_url, params=geocode_params, timeout=10)
+    geocode_response.raise_for_status()
+    geocode_data = geocode_response.json()
+    if not geocode_data:
+        return None
+    return float(geocode_data[0]['lat']), float(geocode_data[0]['lon'])
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_hospitals(lat, lon, radius_m=50000):
+    # Overpass API to find hospitals
+    overpass_url = "http://overpass-api.de/api/interpreter"
+    overpass_query = f"""
+    [out:json];
+    (
+      node["amenity"="hospital"](around:{radius_m},{lat},{lon});
+      way["amenity"="hospital"](around:{radius_m},{lat},{lon});
+      relation["amenity"="hospital"](around:{radius_m},{lat},{lon});
+    );
+    out center qt;
+    """
+    # POST keeps the query out of the URL; the response comes back gzipped
+    overpass_response = SESSION.post(overpass_url, data={'data': overpass_query}, timeout=15)
+    overpass_response.raise_for_status()
+    overpass_data = overpass_response.json()
+
+    # pandas is imported lazily: only this page uses it
+    import pandas as pd
+
+    # Ways and relations only carry a computed center, nodes carry lat/lon
+    df = pd.json_normalize(overpass_data.get('elements', []), max_level=1)
+    missing = pd.Series(index=df.index, dtype=float)
+    df_hospitals = pd.DataFrame({
+        "Name": df.get('tags.name', missing).fillna('Unnamed Hospital'),
+        "Latitude": df.get('lat', missing).combine_first(df.get('center.lat', missing)),
+        "Longitude": df.get('lon', missing).combine_first(df.get('center.lon', missing))
+    })
+    return df_hospitals.dropna(subset=["Latitude", "Longitude"]).reset_index(drop=True)
+
+
+# folium maps do not pickle, so they are cached as resources
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _hospital_map(lat, lon, hospitals):
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    m = folium.Map(location=[lat, lon], zoom_start=12)
+    folium.Marker(
+        [lat, lon],
+        popup="Your Location",
+        icon=folium.Icon(color='red', icon='home')
+    ).add_to(m)
+
+    # One JS array for all hospitals, clustered client-side
+    FastMarkerCluster([list(h) for h in hospitals], callback=_HOSPITAL_MARKER_JS).add_to(m)
+    return m
+
+
 def locate_hospitals():
     st.title("Locate the Best Cancer Hospitals Nearby")
     st.markdown(
@@ -285,23 +758,13 @@ def locate_hospitals():
 
     if st.button("Find Hospitals"):
         with st.spinner("Searching for hospitals..."):
-            # Define headers with User-Agent for Nominatim API
-            headers = {
-                "User-Agent": "CancerSupportApp/1.0 (support@example.com)"
-            }
-
-            # Geocode using Nominatim
-            geocode_url = "https://nominatim.openstreetmap.org/search"
-            geocode_params = {
-                "q": location,
-                "format": "json",
-                "limit": 1
-            }
-
+            # "lat, lon" input skips the geocoding round trip
+            latlon_match = _LATLON_RE.match(location)
             try:
-                geocode_response = requests.get(geocode_url, headers=headers, params=geocode_params, timeout=10)
-                geocode_response.raise_for_status()
-                geocode_data = geocode_response.json()
+                if latlon_match:
+                    coords = float(latlon_match.group(1)), float(latlon_match.group(2))
+                else:
+                    coords = _geocode(location)
             except requests.exceptions.HTTPError as http_err:
                 st.error(f"HTTP error occurred during geocoding: {http_err}")
                 return
@@ -311,98 +774,41 @@ def locate_hospitals():
             except requests.exceptions.RequestException as req_err:
                 st.error(f"An error occurred during geocoding: {req_err}")
                 return
-            except ValueError:
+            except (ValueError, KeyError, TypeError):
                 st.error("Received an invalid response from the geocoding service.")
                 return
 
-            if geocode_data:
-                lat = geocode_data[0].get('lat')
-                lon = geocode_data[0].get('lon')
+            if coords is None:
+                st.error("Location not found. Please try a different location.")
+                return
+            lat, lon = coords
 
-                if not lat or not lon:
-                    st.error("Could not retrieve latitude and longitude for the specified location.")
-                    return
+            try:
+                df_hospitals = _fetch_hospitals(lat, lon)
+            except requests.exceptions.HTTPError as http_err:
+                st.error(f"HTTP error occurred while fetching hospitals: {http_err}")
+                return
+            except requests.exceptions.Timeout:
+                st.error("The request to Overpass API timed out. Please try again later.")
+                return
+            except requests.exceptions.RequestException as req_err:
+                st.error(f"An error occurred while fetching hospitals: {req_err}")
+                return
+            except ValueError:
+                st.error("Received an invalid response from the Overpass API.")
+                return
 
-                try:
-                    lat = float(lat)
-                    lon = float(lon)
-                except ValueError:
-                    st.error("Invalid latitude or longitude values received.")
-                    return
-
-                # Overpass API to find hospitals
-                overpass_url = "http://overpass-api.de/api/interpreter"
-                overpass_query = f"""
-                [out:json];
-                (
-                  node["amenity"="hospital"](around:50000,{lat},{lon});
-                  way["amenity"="hospital"](around:50000,{lat},{lon});
-                  relation["amenity"="hospital"](around:50000,{lat},{lon});
-                );
-                out center;
-                """
+            if not df_hospitals.empty:
+                # Display on map; no map state is sent back to Python
+                hospitals = tuple(df_hospitals[['Latitude', 'Longitude', 'Name']].itertuples(index=False, name=None))
+                from streamlit_folium import st_folium
 
-                try:
-                    overpass_response = requests.get(
-                        overpass_url, 
-                        params={'data': overpass_query}, 
-                        headers=headers, 
-                        timeout=10
-                    )
-                    overpass_response.raise_for_status()
-                    overpass_data = overpass_response.json()
-                except requests.exceptions.HTTPError as http_err:
-                    st.error(f"HTTP error occurred while fetching hospitals: {http_err}")
-                    return
-                except requests.exceptions.Timeout:
-                    st.error("The request to Overpass API timed out. Please try again later.")
-                    return
-                except requests.exceptions.RequestException as req_err:
-                    st.error(f"An error occurred while fetching hospitals: {req_err}")
-                    return
-                except ValueError:
-                    st.error("Received an invalid response from the Overpass API.")
-                    return
-
-                hospitals = []
-                for element in overpass_data.get('elements', []):
-                    tags = element.get('tags', {})
-                    name = tags.get('name', 'Unnamed Hospital')
-                    lat_h = element.get('lat') or (element.get('center', {}).get('lat') if element.get('center') else None)
-                    lon_h = element.get('lon') or (element.get('center', {}).get('lon') if element.get('center') else None)
-                    if lat_h and lon_h:
-                        hospitals.append({
-                            "Name": name,
-                            "Latitude": lat_h,
-                            "Longitude": lon_h
-                        })
-
-                if hospitals:
-                    df_hospitals = pd.DataFrame(hospitals)
-
-                    # Display on map
-                    m = folium.Map(location=[lat, lon], zoom_start=12)
-                    folium.Marker(
-                        [lat, lon],
-                        popup="Your Location",
-                        icon=folium.Icon(color='red', icon='home')
-                    ).add_to(m)
-
-                    for idx, row in df_hospitals.iterrows():
-                        folium.Marker(
-                            [row['Latitude'], row['Longitude']],
-                            popup=row['Name'],
-                            icon=folium.Icon(color='blue', icon='plus-sign')
-                        ).add_to(m)
-
-                    folium_static(m, width=700, height=500)
-
-                    st.subheader("List of Hospitals")
-                    st.dataframe(df_hospitals)
-                else:
-                    st.error("No hospitals found within a 50km radius.")
+                st_folium(_hospital_map(lat, lon, hospitals), width=700, height=500, returned_objects=[])
+
+                st.subheader("List of Hospitals")
+                st.dataframe(df_hospitals)
             else:
-                st.error("Location not found. Please try a different location.")
+                st.error("No hospitals found within a 50km radius.")
 
 
 ###############################
@@ -441,6 +847,38 @@ def accommodation_resources():
 ###############################
 # PAGE: LATEST RESEARCH
 ###############################
+# PubMed and ClinicalTrials.gov update at most daily, so identical queries
+# are served from Streamlit's cache for a day.
+@st.cache_data(ttl=86400, show_spinner=False)
+def _pubmed(cancer_type):
+    # Fetch latest 10 articles from PubMed as (title, pmid) pairs
+    base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+    params = {
+        "db": "pubmed",
+        "term": cancer_type,
+        "retmax": 10,
+        "sort": "pub date",
+        "retmode": "json"
+    }
+    response = SESSION.get(base_url, params=params, timeout=10)
+    response.raise_for_status()
+    id_list = response.json()['esearchresult']['idlist']
+    if not id_list:
+        return []
+
+    # Fetch article summaries as JSON; only the titles are shown
+    summary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+    summary_params = {
+        "db": "pubmed",
+        "id": ",".join(id_list),
+        "retmode": "json"
+    }
+    response = SESSION.get(summary_url, params=summary_params, timeout=10)
+    response.raise_for_status()
+    summaries = response.json()['result']
+    return [(summaries.get(pmid, {}).get('title') or 'No Title', pmid) for pmid in id_list]
+
+
 def latest_research():
     st.title("Latest Research and AI-Driven Insights")
     st.markdown("""
@@ -451,45 +889,20 @@ def latest_research():
 
     if st.button("Get Latest Research"):
         with st.spinner("Fetching latest research articles..."):
-            # Fetch latest 10 articles from PubMed
-            base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-            params = {
-                "db": "pubmed",
-                "term": cancer_type,
-                "retmax": 10,
-                "sort": "pub date",
-                "retmode": "json"
-            }
-            response = requests.get(base_url, params=params).json()
-            id_list = response['esearchresult']['idlist']
-
-            if id_list:
-                # Fetch article details
-                fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-                fetch_params = {
-                    "db": "pubmed",
-                    "id": ",".join(id_list),
-                    "retmode": "xml",
-                    "rettype": "abstract"
-                }
-                fetch_response = requests.get(fetch_url, params=fetch_params).text
-
-                # Parse XML response using xmltodict
-                try:
-                    data_dict = xmltodict.parse(fetch_response)
-                    articles = data_dict.get('PubmedArticleSet', {}).get('PubmedArticle', [])
-
-                    if isinstance(articles, dict):
-                        articles = [articles]
-
-                    st.markdown("### Latest Research Articles")
-                    for article in articles:
-                        title = article.get('MedlineCitation', {}).get('Article', {}).get('ArticleTitle', 'No Title')
-                        pmid = article.get('MedlineCitation', {}).get('PMID', {}).get('#text', '')
-                        link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-                        st.markdown(f"#### [{title}]({link})")
-                except Exception as e:
-                    st.error("Error parsing research articles.")
+            try:
+                articles = _pubmed(cancer_type)
+            except requests.exceptions.RequestException as req_err:
+                st.error(f"An error occurred while fetching research articles: {req_err}")
+                return
+            except Exception:
+                st.error("Error parsing research articles.")
+                return
+
+            if articles:
+                st.markdown("### Latest Research Articles")
+                for title, pmid in articles:
+                    link = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+                    st.markdown(f"#### [{title}]({link})")
             else:
                 st.warning("No articles found for the specified cancer type.")
 
@@ -558,6 +971,40 @@ def financial_support():
 ###############################
 # PAGE: CLINICAL TRIALS
 ###############################
+def _study_summary(study):
+    protocol = study.get('protocolSection', {})
+    identification = protocol.get('identificationModule', {})
+    locations = protocol.get('contactsLocationsModule', {}).get('locations', [])
+    # Some trials won't list locations; handle gracefully
+    countries = list(dict.fromkeys(loc['country'] for loc in locations if loc.get('country')))
+    return {
+        "title": identification.get('officialTitle') or identification.get('briefTitle', 'No Title'),
+        "status": protocol.get('statusModule', {}).get('overallStatus', 'Status Unknown'),
+        "phase": ", ".join(protocol.get('designModule', {}).get('phases', [])) or 'N/A',
+        "nct_id": identification.get('nctId', ''),
+        "locations": ", ".join(countries) if countries else "Unknown"
+    }
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _trials(cancer_type, location, phase):
+    # ClinicalTrials.gov v2 API, JSON natively
+    base_url = "https://clinicaltrials.gov/api/v2/studies"
+    params = {
+        "query.cond": cancer_type,
+        "query.locn": location,
+        "pageSize": 20,
+        "format": "json"
+    }
+    if phase != "All":
+        # "Phase 2" -> AREA[Phase]PHASE2
+        params["filter.advanced"] = f"AREA[Phase]{phase.replace(' ', '').upper()}"
+
+    response = SESSION.get(base_url, params=params, timeout=10)
+    response.raise_for_status()
+    return [_study_summary(study) for study in response.json().get('studies', [])]
+
+
 def clinical_trials():
     st.title("Clinical Trials Finder")
     st.markdown("""
@@ -571,26 +1018,8 @@ def clinical_trials():
 
     if st.button("Find Clinical Trials"):
         with st.spinner("Searching for clinical trials..."):
-            # Refine the search query
-            query = f"{cancer_type}[Condition] AND {location}[Location]"
-            if phase != "All":
-                query += f" AND {phase}[Phase]"
-
-            base_url = "https://clinicaltrials.gov/api/query/study/search/brief"
-            params = {
-                "expr": query,
-                "min_rnk": 1,
-                "max_rnk": 20,
-                "fmt": "xml"
-            }
-
-            headers = {
-                "User-Agent": "CancerSupportApp/1.0 (support@example.com)"
-            }
-
             try:
-                response = requests.get(base_url, params=params, headers=headers, timeout=10)
-                response.raise_for_status()
+                studies = _trials(cancer_type, location, phase)
             except requests.exceptions.HTTPError as http_err:
                 st.error(f"HTTP error occurred while fetching clinical trials: {http_err}")
                 return
@@ -600,47 +1029,22 @@ def clinical_trials():
             except requests.exceptions.RequestException as req_err:
                 st.error(f"An error occurred while fetching clinical trials: {req_err}")
                 return
-
-            # Parse the XML response
-            try:
-                data_dict = xmltodict.parse(response.content)
-                studies = data_dict.get('clinical_studies', {}).get('clinical_study', [])
-
-                if isinstance(studies, dict):
-                    studies = [studies]
-
-                if studies:
-                    st.markdown("### Found Clinical Trials")
-                    for study in studies:
-                        title = study.get('official_title', 'No Title')
-                        status = study.get('overall_status', 'Status Unknown')
-
-                        location_info = study.get('location_countries', {}).get('location_country', [])
-                        if isinstance(location_info, dict):
-                            location_info = [location_info]
-                        # Some trials won't have location_countries; handle gracefully
-                        if location_info:
-                            # Attempt to read location text
-                            try:
-                                locations = ", ".join([loc.get('location', 'Unknown') for loc in location_info])
-                            except:
-                                locations = "Unknown"
-                        else:
-                            locations = "Unknown"
-
-                        phase_text = study.get('phase', 'N/A')
-                        nct_id = study.get('id_info', {}).get('nct_id', '')
-                        link = f"https://clinicaltrials.gov/ct2/show/{nct_id}" if nct_id else "#"
-
-                        st.markdown(f"#### [{title}]({link})")
-                        st.write(f"**Status:** {status}")
-                        st.write(f"**Phase:** {phase_text}")
-                        st.write(f"**Locations:** {locations}")
-                        st.markdown("---")
-                else:
-                    st.warning("No clinical trials found for the given criteria.")
-            except Exception as e:
+            except Exception:
                 st.error("Error parsing clinical trials data.")
+                return
+
+            if studies:
+                st.markdown("### Found Clinical Trials")
+                for study in studies:
+                    link = f"https://clinicaltrials.gov/study/{study['nct_id']}" if study['nct_id'] else "#"
+
+                    st.markdown(f"#### [{study['title']}]({link})")
+                    st.write(f"**Status:** {study['status']}")
+                    st.write(f"**Phase:** {study['phase']}")
+                    st.write(f"**Locations:** {study['locations']}")
+                    st.markdown("---")
+            else:
+                st.warning("No clinical trials found for the given criteria.")
 
     st.markdown("---")
     st.header("Enrollment Guide")
@@ -748,6 +1152,11 @@ def interactive_tools_extras():
 ###############################
 # PAGE: SYMPTOM CHECKER
 ###############################
+# Rule sets for the symptom checker; a non-empty intersection triggers the rule
+_URGENT = frozenset({"Unintentional Weight Loss", "Persistent Pain"})
+_FEVER = frozenset({"Fever"})
+_SWALLOW = frozenset({"Difficulty Swallowing"})
+
 def symptom_checker():
     st.title("Symptom Checker (Beta)")
     st.markdown("""
@@ -777,12 +1186,13 @@ def symptom_checker():
 
         # Very simple example of "analysis"
         # (Real systems would use advanced ML and medical knowledge.)
+        sel = frozenset(selected_symptoms)
         suggestion = ""
-        if "Unintentional Weight Loss" in selected_symptoms or "Persistent Pain" in selected_symptoms:
+        if sel & _URGENT:
             suggestion += "- You have selected symptoms that may warrant a more urgent evaluation.\n"
-        if "Fever" in selected_symptoms:
+        if sel & _FEVER:
             suggestion += "- Persistent or recurring fever should be discussed with a doctor.\n"
-        if "Difficulty Swallowing" in selected_symptoms:
+        if sel & _SWALLOW:
             suggestion += "- Difficulty swallowing can be related to certain esophageal or throat issues.\n"
 
         if not suggestion:
@@ -795,51 +1205,139 @@ def symptom_checker():
 ###############################
 # PAGE: MEDICATION TRACKER
 ###############################
+# Signed-in users (st.login) keep their medications in a local SQLite file,
+# keyed by their account, so the list survives new sessions and server
+# restarts. WAL mode lets readers proceed while a session is writing.
+# Anonymous sessions get a private in-memory database that goes away with
+# the session, so their rows are never reachable from anywhere else.
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.db")
+
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS medications(user TEXT, name TEXT, dose TEXT, freq TEXT)")
+    return conn
+
+@st.cache_resource
+def _shared_db():
+    return _connect(DB_PATH)
+
+def _db_user():
+    # The signed-in account's email, or "" for an anonymous session
+    user = getattr(st, "user", None)
+    if user is None or not getattr(user, "is_logged_in", False):
+        return ""
+    return user.email
+
+def _db():
+    if _db_user():
+        return _shared_db()
+    if "med_db" not in st.session_state:
+        st.session_state.med_db = _connect(":memory:")
+    return st.session_state.med_db
+
+# Form callbacks run before the rerun, so the page only renders the result.
+# Their messages are stashed in session state and shown where the form is.
+def _flash(key, kind, message):
+    st.session_state[key] = (kind, message)
+
+def _show_flash(key):
+    flash = st.session_state.pop(key, None)
+    if flash is not None:
+        kind, message = flash
+        getattr(st, kind)(message)
+
+def _add_med():
+    med_name = st.session_state.med_name
+    dosage = st.session_state.med_dosage
+    frequency = st.session_state.med_frequency
+    if med_name and dosage and frequency:
+        # RETURNING reads the id in the same statement: lastrowid on the
+        # shared connection could be another session's concurrent insert
+        (rowid,) = _db().execute(
+            "INSERT INTO medications(user, name, dose, freq) VALUES (?, ?, ?, ?) RETURNING rowid",
+            (_db_user(), med_name, dosage, frequency)
+        ).fetchone()
+        st.session_state.medication_ids.append(rowid)
+        st.session_state.medications.append({
+            "Medication": med_name,
+            "Dosage": dosage,
+            "Frequency": frequency
+        })
+        _flash("med_form_flash", "success", "Medication added successfully!")
+    else:
+        _flash("med_form_flash", "error", "Please fill in all fields.")
+
+def _remove_med():
+    remove_index = st.session_state.med_remove_index
+    try:
+        cursor = _db().execute(
+            "DELETE FROM medications WHERE rowid = ? AND user = ?",
+            (st.session_state.medication_ids[remove_index], _db_user())
+        )
+    except IndexError:
+        _flash("med_remove_flash", "error", "Invalid index. Cannot remove.")
+        return
+    st.session_state.medication_ids.pop(remove_index)
+    st.session_state.medications.pop(remove_index)
+    if cursor.rowcount:
+        _flash("med_remove_flash", "success", "Medication removed.")
+    else:
+        # Another session of the same account removed it first
+        _flash("med_remove_flash", "warning", "That medication had already been removed.")
+
 def medication_tracker():
     st.title("Medication Tracker")
     st.markdown("""
     Keep track of your medications, dosages, and schedules.
     """)
 
+    conn = _db()
+
+    # Loaded from the database once per session, then kept in step with it
+    # incrementally. Rows stay plain dicts, which st.dataframe renders
+    # directly; their rowids are kept alongside for removal.
     if "medications" not in st.session_state:
-        st.session_state.medications = []
+        rows = conn.execute(
+            "SELECT rowid, name, dose, freq FROM medications WHERE user = ? ORDER BY rowid",
+            (_db_user(),)
+        ).fetchall()
+        st.session_state.medication_ids = [row[0] for row in rows]
+        st.session_state.medications = [
+            {"Medication": name, "Dosage": dose, "Frequency": freq} for _, name, dose, freq in rows
+        ]
 
     with st.form("med_form"):
-        med_name = st.text_input("Medication Name")
-        dosage = st.text_input("Dosage (e.g., 50mg)")
-        frequency = st.text_input("Frequency (e.g., 2 times a day)")
-        add_med = st.form_submit_button("Add Medication")
-
-        if add_med:
-            if med_name and dosage and frequency:
-                st.session_state.medications.append({
-                    "Medication": med_name,
-                    "Dosage": dosage,
-                    "Frequency": frequency
-                })
-                st.success("Medication added successfully!")
-            else:
-                st.error("Please fill in all fields.")
+        st.text_input("Medication Name", key="med_name")
+        st.text_input("Dosage (e.g., 50mg)", key="med_dosage")
+        st.text_input("Frequency (e.g., 2 times a day)", key="med_frequency")
+        st.form_submit_button("Add Medication", on_click=_add_med)
+        _show_flash("med_form_flash")
 
     if st.session_state.medications:
         st.markdown("### Your Current Medications")
-        df_meds = pd.DataFrame(st.session_state.medications)
-        st.dataframe(df_meds)
+        st.dataframe(st.session_state.medications)
 
         # Option to remove medications
-        remove_index = st.number_input("Enter the index of the medication to remove", min_value=0, 
-                                       max_value=len(st.session_state.medications)-1, value=0)
-        if st.button("Remove Selected Medication"):
-            try:
-                st.session_state.medications.pop(remove_index)
-                st.success("Medication removed.")
-            except IndexError:
-                st.error("Invalid index. Cannot remove.")
+        st.number_input("Enter the index of the medication to remove", min_value=0, 
+                        max_value=len(st.session_state.medications)-1, value=0, key="med_remove_index")
+        st.button("Remove Selected Medication", on_click=_remove_med)
+    _show_flash("med_remove_flash")
 
 
 ###############################
 # PAGE: PERSONAL JOURNAL
 ###############################
+def _add_journal_entry():
+    entry_date = st.session_state.journal_date
+    entry_text = st.session_state.journal_text
+    if entry_text.strip():
+        # Kept sorted by date on insert, so rendering never sorts
+        bisect.insort(st.session_state.journal_entries, (entry_date.toordinal(), entry_date, entry_text))
+        _flash("journal_flash", "success", "Journal entry saved!")
+    else:
+        _flash("journal_flash", "error", "Please write something in the journal entry.")
+
 def personal_journal():
     st.title("Personal Journal")
     st.markdown("Write daily reflections, track emotional states, or record important thoughts.")
@@ -848,31 +1346,36 @@ def personal_journal():
         st.session_state.journal_entries = []
 
     with st.form("journal_form"):
-        entry_date = st.date_input("Entry Date", datetime.now())
-        entry_text = st.text_area("Your Journal Entry")
-        add_entry = st.form_submit_button("Save Entry")
-
-        if add_entry:
-            if entry_text.strip():
-                st.session_state.journal_entries.append({
-                    "date": entry_date,
-                    "entry": entry_text
-                })
-                st.success("Journal entry saved!")
-            else:
-                st.error("Please write something in the journal entry.")
+        st.date_input("Entry Date", datetime.now(), key="journal_date")
+        st.text_area("Your Journal Entry", key="journal_text")
+        st.form_submit_button("Save Entry", on_click=_add_journal_entry)
+        _show_flash("journal_flash")
 
     if st.session_state.journal_entries:
         st.markdown("### Your Journal Entries")
-        for idx, item in enumerate(sorted(st.session_state.journal_entries, key=lambda x: x["date"], reverse=True)):
-            st.markdown(f"**{item['date']}**")
-            st.write(item["entry"])
+        # Entries are free-form markdown, so each gets its own element: an
+        # unclosed fence or ** in one entry cannot swallow the ones after it
+        for _, entry_date, entry_text in reversed(st.session_state.journal_entries):
+            st.markdown(f"**{entry_date}**")
+            st.write(entry_text)
             st.markdown("---")
 
 
 ###############################
 # PAGE: APPOINTMENT SCHEDULER
 ###############################
+def _add_appointment():
+    appt_title = st.session_state.appt_title
+    if appt_title.strip():
+        # Kept sorted by (date, time) on insert, so rendering never sorts
+        bisect.insort(
+            st.session_state.appointments,
+            (st.session_state.appt_date, st.session_state.appt_time, appt_title)
+        )
+        _flash("appt_flash", "success", "Appointment added successfully!")
+    else:
+        _flash("appt_flash", "error", "Please provide a title for the appointment.")
+
 def appointment_scheduler():
     st.title("Appointment Scheduler")
     st.markdown("Organize your upcoming medical visits, therapy sessions, or check-ups.")
@@ -881,62 +1384,54 @@ def appointment_scheduler():
         st.session_state.appointments = []
 
     with st.form("appt_form"):
-        appt_title = st.text_input("Appointment Title")
-        appt_date = st.date_input("Date", datetime.now())
-        appt_time = st.time_input("Time", datetime.now().time())
-        submit_appt = st.form_submit_button("Add Appointment")
-
-        if submit_appt:
-            if appt_title.strip():
-                st.session_state.appointments.append({
-                    "title": appt_title,
-                    "date": appt_date,
-                    "time": appt_time
-                })
-                st.success("Appointment added successfully!")
-            else:
-                st.error("Please provide a title for the appointment.")
+        st.text_input("Appointment Title", key="appt_title")
+        st.date_input("Date", datetime.now(), key="appt_date")
+        st.time_input("Time", datetime.now().time(), key="appt_time")
+        st.form_submit_button("Add Appointment", on_click=_add_appointment)
+        _show_flash("appt_flash")
 
     if st.session_state.appointments:
         st.markdown("### Upcoming Appointments")
-        sorted_appts = sorted(st.session_state.appointments, key=lambda x: (x["date"], x["time"]))
-        for appt in sorted_appts:
-            st.markdown(f"- **{appt['title']}** on **{appt['date']}** at **{appt['time']}**")
+        st.markdown("\n".join(
+            f"- **{appt_title}** on **{appt_date}** at **{appt_time}**"
+            for appt_date, appt_time, appt_title in st.session_state.appointments
+        ))
 
 
 ###############################
 # PAGE: AI CHATBOT
 ###############################
+_WS = re.compile(r"\s+")
+
 def ai_chatbot():
     st.title("AI Chatbot (Beta)")
     st.markdown("""
     Ask general questions about cancer, treatments, resources, and more. 
-    This chatbot uses a local **Question-Answering** model (DistilBERT) and a curated text context.  
+    This chatbot uses a local **Question-Answering** model (MiniLM) and a curated text context.  
     **Disclaimer**: Always consult a qualified professional for medical advice.
     """)
 
-    # A sample context about cancer from reputable sources (shortened for demonstration)
-    context = """
-    Cancer is a group of diseases characterized by the uncontrolled growth and spread of abnormal cells. 
-    There are over 100 different types of cancer. Treatment options vary and may include surgery, chemotherapy, radiation therapy, 
-    targeted therapy, immunotherapy, or a combination of these. Early detection and accurate diagnosis are crucial for better outcomes. 
-    Various support services exist to help patients cope with the physical, emotional, and financial challenges of cancer.
-    """
-
-    if nlp_qa is None:
+    # The model is only loaded once somebody opens this page
+    try:
+        with st.spinner("Loading the QA model..."):
+            # Tokenize the shared context up front, alongside the model
+            _encode_context(load_qa_pipeline().tokenizer, QA_CONTEXT)
+    except Exception:
         st.error("The QA model is not available. Please ensure 'transformers' is installed and try again.")
         return
 
     user_question = st.text_input("Enter your question about cancer:")
     if st.button("Get Answer"):
-        if user_question.strip():
+        # One normalized form per question keeps the answer cache hit rate up
+        q = _WS.sub(" ", user_question).strip().lower()
+        if q:
             with st.spinner("Thinking..."):
                 try:
-                    result = nlp_qa({
-                        'question': user_question,
-                        'context': context
-                    })
-                    st.write(f"**Answer**: {result['answer']}")
+                    answer = _qa(q, QA_CONTEXT)
+                    if answer:
+                        st.write(f"**Answer**: {answer}")
+                    else:
+                        st.info("I couldn't find an answer to that in my reference text. Try rephrasing your question.")
                 except Exception as e:
                     st.error(f"An error occurred while processing your question: {e}")
         else:
@@ -946,35 +1441,24 @@ def ai_chatbot():
 ###############################
 # MAIN RENDER FUNCTION
 ###############################
+PAGE_FNS = {p: fn for p, fn in zip(PAGES, [
+    home_page,
+    locate_hospitals,
+    accommodation_resources,
+    latest_research,
+    financial_support,
+    clinical_trials,
+    emotional_social_support,
+    interactive_tools_extras,
+    symptom_checker,
+    medication_tracker,
+    personal_journal,
+    appointment_scheduler,
+    ai_chatbot
+])}
+
 def render_page(page_name):
-    if page_name == "Home":
-        home_page()
-    elif page_name == "Locate Hospitals":
-        locate_hospitals()
-    elif page_name == "Accommodation Resources":
-        accommodation_resources()
-    elif page_name == "Latest Research":
-        latest_research()
-    elif page_name == "Financial Support":
-        financial_support()
-    elif page_name == "Clinical Trials":
-        clinical_trials()
-    elif page_name == "Emotional & Social Support":
-        emotional_social_support()
-    elif page_name == "Interactive Tools & Extras":
-        interactive_tools_extras()
-    elif page_name == "Symptom Checker":
-        symptom_checker()
-    elif page_name == "Medication Tracker":
-        medication_tracker()
-    elif page_name == "Personal Journal":
-        personal_journal()
-    elif page_name == "Appointment Scheduler":
-        appointment_scheduler()
-    elif page_name == "AI Chatbot (Beta)":
-        ai_chatbot()
-    else:
-        home_page()
+    PAGE_FNS.get(page_name, home_page)()
 
 
 def main():